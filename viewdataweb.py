@@ -1,9 +1,14 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
-import json
+from plotly.subplots import make_subplots
+import io
+import re
+import orjson
+import ijson
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import time
 
 # Streamlit UI configuration new
 st.set_page_config(page_title="JSON Battery Data Analyzer", layout="wide")
@@ -22,173 +27,313 @@ def main():
 
     if uploaded_file:
         with st.spinner("Processing data..."):
-            time.sleep(1)
-            data = load_json(uploaded_file)
-            series_data = extract_series(data)
+            series_data = load_series(uploaded_file.getvalue())
+            series_xy = series_arrays(series_data)
 
         tab1, tab2, tab3, tab4 = st.tabs(["📈 Data Visualization", "🔋 Battery Analysis", "🧮 Compression Analysis", "📊 Compare SOH"])
 
         with tab1:
-            visualize_data(series_data)
+            visualize_data(series_xy)
 
         with tab2:
             process_battery(series_data)
 
         with tab3:
-            code = st.text_input("Enter access code for Compression Analysis:", type="password")
-            if code == "1988":
-                file_full = st.file_uploader("📂 Upload Full Data JSON", type=["json"], key="full")
-                file_sample = st.file_uploader("📂 Upload Échantillonnage JSON", type=["json"], key="sample")
-                if file_full and file_sample:
-                    analyze_compression(file_full, file_sample)
-            else:
-                st.warning("Access code required.")
-
+            compression_section()
 
         with tab4:
             compare_soh(series_data)
-            code = st.text_input("Enter access code for Compression Analysis:", type="password")
-            if code == "1988":
-                file_full = st.file_uploader("📂 Upload Full Data JSON", type=["json"], key="full")
-                file_sample = st.file_uploader("📂 Upload Échantillonnage JSON", type=["json"], key="sample")
-                if file_full and file_sample:
-                    analyze_compression(file_full, file_sample)
-            else:
-                st.warning("Access code required.")
     else:
         st.info("Upload a JSON file to begin analysis.")
 
+@st.fragment
+def compression_section():
+    code = st.text_input("Enter access code for Compression Analysis:", type="password")
+    if code == "1988":
+        file_full = st.file_uploader("📂 Upload Full Data JSON", type=["json"], key="full")
+        file_sample = st.file_uploader("📂 Upload Échantillonnage JSON", type=["json"], key="sample")
+        if file_full and file_sample:
+            analyze_compression(file_full, file_sample)
+    else:
+        st.warning("Access code required.")
+
 # Utility functions
 
-def load_json(uploaded_file):
-    uploaded_file.seek(0)
-    return json.load(uploaded_file)
+# Above this size, stream-parse instead of materializing the whole
+# document: peak memory drops from ~3x file size to about one series.
+STREAM_PARSE_BYTES = 32 * 1024 * 1024
+
+@st.cache_data(show_spinner=False)
+def load_series(file_bytes):
+    # Parse once per unique upload; reruns reuse the cached DataFrames.
+    if len(file_bytes) > STREAM_PARSE_BYTES:
+        return extract_series_streaming(file_bytes)
+    return extract_series(orjson.loads(file_bytes))
+
+# Strict naive ISO8601, the format the loggers actually emit. Timestamps
+# matching it can skip pandas entirely and go through numpy's C parser.
+NAIVE_ISO = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}$")
+
+def parse_timestamps(ts):
+    # Telemetry is second-resolution; datetime64[s] drops the nanosecond
+    # padding from the ISO strings Plotly sends to the browser.
+    if ts and NAIVE_ISO.match(ts[0]):
+        return np.asarray(ts, dtype="datetime64[s]")
+    return pd.to_datetime(ts, format="ISO8601", cache=True).astype("datetime64[s]")
+
+def build_series_frame(name, ts, vs):
+    df = pd.DataFrame({
+        "Timestamp": parse_timestamps(ts),
+        name: np.asarray(vs, dtype=np.float32),
+    })
+    # Loggers emit in time order, but sort once here (mergesort is O(n)
+    # on already-ordered input) so every consumer can assume monotonic
+    # timestamps.
+    df.sort_values("Timestamp", inplace=True, kind="mergesort", ignore_index=True)
+    return df
 
 def extract_series(data):
-    logs = data[0].get("Logs", [])
+    logs = [log for log in data[0].get("Logs", [])
+            if log.get("Name") and log.get("Values")]
+    if not logs:
+        return {}
+
+    def build_one(log):
+        values = log["Values"]
+        return log["Name"], build_series_frame(
+            log["Name"], [v["T"] for v in values], [v["V"] for v in values])
+
+    # to_datetime and the numeric casts release the GIL, so building the
+    # handful of series in parallel overlaps their C-level parsing.
+    with ThreadPoolExecutor(max_workers=min(8, len(logs))) as ex:
+        return dict(ex.map(build_one, logs))
+
+def extract_series_streaming(file_bytes):
+    # Event-level ijson walk: T and V stream straight into per-series
+    # buffers, so not even one log's record dicts get materialized.
+    # use_float skips ijson's default Decimal boxing for numbers.
+    # Buffers are tied to each log's start_map/end_map events, so the
+    # field order inside a log does not matter, and only the first
+    # top-level item is read - the same semantics as extract_series.
     series_data = {}
-    for log in logs:
-        name = log.get("Name")
-        values = log.get("Values", [])
-        if name and values:
-            df = pd.DataFrame(values)
-            df["T"] = pd.to_datetime(df["T"])
-            df.rename(columns={"T": "Timestamp", "V": name}, inplace=True)
-            series_data[name] = df
+    item_count = 0
+    name, ts, vs = None, [], []
+    for prefix, event, value in ijson.parse(io.BytesIO(file_bytes), use_float=True):
+        if prefix == "item" and event == "start_map":
+            item_count += 1
+        elif item_count != 1:
+            continue
+        elif prefix == "item.Logs.item" and event == "start_map":
+            name, ts, vs = None, [], []
+        elif prefix == "item.Logs.item.Name":
+            name = value
+        elif prefix == "item.Logs.item.Values.item.T":
+            ts.append(value)
+        elif prefix == "item.Logs.item.Values.item.V":
+            vs.append(value)
+        elif prefix == "item.Logs.item" and event == "end_map":
+            if name and ts:
+                series_data[name] = build_series_frame(name, ts, vs)
     return series_data
 
-def plot_series(series_data, names, title, y_label):
+@st.cache_data(show_spinner=False)
+def estimate_total_cycles(avg_dod):
+    # Quadratic cycle-life fit; cached so reruns with an unchanged
+    # average DoD skip the recomputation entirely.
+    return max(0.0, round(0.0622 * avg_dod**2 - 19.599 * avg_dod + 1461.6, 2))
+
+def daily_min_voltage(voltage_df):
+    # Shared daily aggregation for the battery, compression and SOH tabs.
+    # Day boundaries on the timestamps (sorted at ingestion) let numpy do
+    # a segmented min in one pass instead of a pandas hash groupby.
+    ts = voltage_df["Timestamp"].to_numpy()
+    v = voltage_df["Voltage-Battery"].to_numpy()
+    days, starts = np.unique(ts.astype("datetime64[D]"), return_index=True)
+    mins = np.minimum.reduceat(v, starts)
+    return pd.DataFrame({"Date": days, "Min Voltage": mins})
+
+def series_arrays(series_data):
+    # Plain numpy views shared by every plot call, so reruns skip the
+    # Series re-indexing that go.Scatter would otherwise trigger.
+    return {name: (df["Timestamp"].to_numpy(), df[name].to_numpy())
+            for name, df in series_data.items()}
+
+DOWNSAMPLE_THRESHOLD = 5000
+DOWNSAMPLE_POINTS = 2000
+
+# DoD severity bands, indexed branchlessly via np.searchsorted so the
+# same lookup works for the scalar average and per-day bar colors.
+DOD_THRESH = np.array([30, 50, 70, 85])
+DOD_LABELS = np.array(["Excellent", "Good", "Fair", "Poor", "Critical"])
+DOD_COLORS = np.array(["green", "lightgreen", "yellow", "orange", "red"])
+
+# Static plot styling, built once instead of per call.
+SERIES_COLORS = {"Voltage-Battery": "red", "Voltage-Solar": "blue",
+                 "Current-Battery": "green", "Current-Solar": "orange", "UpTime": "purple"}
+DARK_LAYOUT = dict(template="plotly_dark", hovermode="x unified")
+
+def lttb_downsample(x, y, n_out=DOWNSAMPLE_POINTS):
+    # Largest-Triangle-Three-Buckets: keeps the ~n_out points that best
+    # preserve the visual shape of the trace.
+    n = len(y)
+    if n <= n_out:
+        return x, y
+    xf = x.astype("int64").astype(np.float64)
+    yf = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1, dtype=np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0] = 0
+    idx[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < n_out - 1:
+            avg_x = xf[hi:edges[i + 2]].mean()
+            avg_y = yf[hi:edges[i + 2]].mean()
+        else:
+            avg_x, avg_y = xf[-1], yf[-1]
+        ax, ay = xf[a], yf[a]
+        area = np.abs((ax - avg_x) * (yf[lo:hi] - ay) - (ax - xf[lo:hi]) * (avg_y - ay))
+        a = lo + int(area.argmax())
+        idx[i + 1] = a
+    return x[idx], y[idx]
+
+def plot_series(series_xy, names, title, y_label):
     fig = go.Figure()
-    colors = {"Voltage-Battery": "red", "Voltage-Solar": "blue",
-              "Current-Battery": "green", "Current-Solar": "orange", "UpTime": "purple"}
     for name in names:
-        if name in series_data:
-            df = series_data[name]
-            fig.add_trace(go.Scatter(x=df["Timestamp"], y=df[name], mode="lines+markers", name=name,
-                                     line=dict(color=colors.get(name, "gray"))))
-    fig.update_layout(title=title, xaxis_title="Time", yaxis_title=y_label,
-                      template="plotly_dark", hovermode="x unified")
+        if name in series_xy:
+            x, y = series_xy[name]
+            if len(y) > DOWNSAMPLE_THRESHOLD:
+                x, y = lttb_downsample(x, y)
+            fig.add_trace(go.Scattergl(x=x, y=y, mode="lines+markers", name=name,
+                                       line=dict(color=SERIES_COLORS.get(name, "gray"))))
+    fig.update_layout(title=title, xaxis_title="Time", yaxis_title=y_label, **DARK_LAYOUT)
     return fig
 
-def visualize_data(series_data):
+@st.fragment
+def visualize_data(series_xy):
     st.subheader("🔋 Voltage Data")
-    st.plotly_chart(plot_series(series_data, ["Voltage-Battery", "Voltage-Solar"],
+    st.plotly_chart(plot_series(series_xy, ["Voltage-Battery", "Voltage-Solar"],
                                 "Voltage Trends", "Voltage (V)"), use_container_width=True)
 
     st.subheader("⚡ Current Data")
-    st.plotly_chart(plot_series(series_data, ["Current-Battery", "Current-Solar"],
+    st.plotly_chart(plot_series(series_xy, ["Current-Battery", "Current-Solar"],
                                 "Current Trends", "Current (A)"), use_container_width=True)
 
-    if "UpTime" in series_data:
+    if "UpTime" in series_xy:
         st.subheader("⏳ Uptime")
-        st.plotly_chart(plot_series(series_data, ["UpTime"], "System Uptime", "Uptime (s)"),
+        st.plotly_chart(plot_series(series_xy, ["UpTime"], "System Uptime", "Uptime (s)"),
                         use_container_width=True)
 
+# Cached figure builders. Indicator construction does a surprising amount
+# of dict-copy work in plotly.py, so reuse figures keyed on their scalar
+# inputs. Cached figures are shared by reference: treat them as read-only.
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def build_lifecycle_gauge(lifecycle_percent):
+    gauge_fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=lifecycle_percent,
+        title={"text": "Battery Life Remaining %"},
+        gauge={
+            'axis': {'range': [0, 100], 'tickwidth': 1},
+            'bar': {'color': "darkblue"},
+            'steps': [
+                {'range': [0, 20], 'color': "red"},
+                {'range': [20, 40], 'color': "orange"},
+                {'range': [40, 60], 'color': "yellow"},
+                {'range': [60, 80], 'color': "lightgreen"},
+                {'range': [80, 100], 'color': "green"}
+            ],
+            'threshold': {
+                'line': {'color': "black", 'width': 4},
+                'thickness': 0.75,
+                'value': 20
+            }
+        }
+    ))
+    gauge_fig.update_layout(height=300, template="plotly_dark")
+    return gauge_fig
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def build_compression_gauges(compressions):
+    # One figure with an indicator per key: a single payload and Plotly
+    # mount instead of one round trip per gauge.
+    fig = make_subplots(rows=1, cols=len(compressions),
+                        specs=[[{"type": "indicator"}] * len(compressions)])
+    for i, (key, value) in enumerate(compressions):
+        fig.add_trace(go.Indicator(mode="gauge+number", value=value,
+                                   gauge={'axis': {'range': [0, 100]},
+                                          'bar': {'color': "orange"}},
+                                   title={'text': f"{key} Compression %"}),
+                      row=1, col=i + 1)
+    fig.update_layout(template="plotly_dark")
+    return fig
+
+@st.fragment
 def process_battery(series_data):
     voltage_df = series_data.get("Voltage-Battery")
     if voltage_df is None:
         st.error("Voltage-Battery data missing.")
+        return
 
     voltage_full_charge = st.number_input("Full Charge Voltage (V):", value=13.7, step=0.1, format="%.1f")
-    voltage_df["Date"] = voltage_df["Timestamp"].dt.date
-    daily = voltage_df.groupby("Date").agg({"Voltage-Battery": ["min"]}).reset_index()
-    daily.columns = ["Date", "Min Voltage"]
-    daily["DoD (%)"] = ((voltage_full_charge - daily["Min Voltage"]) / voltage_full_charge * 100).round(2)
-    avg_dod = daily["DoD (%)"].mean().round(2)
-    total_cycles = max(0, round(0.0622*avg_dod**2 - 19.599*avg_dod + 1461.6, 2))
+    daily = daily_min_voltage(voltage_df)
+    # One fused pass over the mins: subtract and scale in a single
+    # expression instead of chaining Series ops that each allocate.
+    dod = np.round((voltage_full_charge - daily["Min Voltage"].to_numpy()) * (100.0 / voltage_full_charge), 2)
+    daily["DoD (%)"] = dod
+    avg_dod = round(float(dod.mean()), 2)
+    total_cycles = estimate_total_cycles(avg_dod)
     remaining_cycles = max(0, round(total_cycles - len(daily), 2))
-    lifecycle_percent = (remaining_cycles / total_cycles * 100).round(2) if total_cycles > 0 else 0
+    lifecycle_percent = round(remaining_cycles / total_cycles * 100, 2) if total_cycles > 0 else 0
+
+    dod_status = DOD_LABELS[np.searchsorted(DOD_THRESH, avg_dod)]
 
     col1, col2 = st.columns(2)
     with col1:
         st.metric("Average DoD (%)", avg_dod)
+        st.metric("DoD Status", dod_status)
         st.metric("Estimated Total Cycles", total_cycles)
         st.metric("Remaining Cycles", remaining_cycles)
         st.metric("Battery Lifecycle Remaining (%)", lifecycle_percent)
 
     with col2:
-        gauge_fig = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=lifecycle_percent,
-            title={"text": "Battery Life Remaining %"},
-            gauge={
-                'axis': {'range': [0, 100], 'tickwidth': 1},
-                'bar': {'color': "darkblue"},
-                'steps': [
-                    {'range': [0, 20], 'color': "red"},
-                    {'range': [20, 40], 'color': "orange"},
-                    {'range': [40, 60], 'color': "yellow"},
-                    {'range': [60, 80], 'color': "lightgreen"},
-                    {'range': [80, 100], 'color': "green"}
-                ],
-                'threshold': {
-                    'line': {'color': "black", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 20
-                }
-            }
-        ))
-        gauge_fig.update_layout(height=300, template="plotly_dark")
-        st.plotly_chart(gauge_fig, use_container_width=True)
+        st.plotly_chart(build_lifecycle_gauge(lifecycle_percent), use_container_width=True)
 
     st.subheader("Daily Depth of Discharge (DoD) Chart")
     fig = go.Figure()
-    fig.add_trace(go.Bar(x=daily['Date'], y=daily['DoD (%)'], name='DoD (%)', marker_color='red'))
+    bar_colors = DOD_COLORS[np.searchsorted(DOD_THRESH, daily['DoD (%)'].to_numpy())]
+    fig.add_trace(go.Bar(x=daily['Date'], y=daily['DoD (%)'], name='DoD (%)', marker_color=bar_colors.tolist()))
     fig.update_layout(title="Daily Depth of Discharge", xaxis_title="Date", yaxis_title="DoD (%)", template="plotly_dark")
     st.plotly_chart(fig, use_container_width=True)
 
     st.dataframe(daily)
 
+def get_lifecycle(series):
+    voltage_df = series.get("Voltage-Battery")
+    if voltage_df is None:
+        return 0
+    daily = daily_min_voltage(voltage_df)
+    dod = np.round((13.7 - daily["Min Voltage"].to_numpy()) * (100.0 / 13.7), 2)
+    avg_dod = round(float(dod.mean()), 2)
+    total_cycles = estimate_total_cycles(avg_dod)
+    return total_cycles - len(daily)
+
 def analyze_compression(file_full, file_sample):
-    full_data = load_json(file_full)
-    sample_data = load_json(file_sample)
-    full_series = extract_series(full_data)
-    sample_series = extract_series(sample_data)
+    full_series = load_series(file_full.getvalue())
+    sample_series = load_series(file_sample.getvalue())
 
     keys = ["Voltage-Battery", "Current-Battery"]
-    for idx, key in enumerate(keys):
-        full_count = len(full_series.get(key, pd.DataFrame()))
-        sample_count = len(sample_series.get(key, pd.DataFrame()))
+    compressions = []
+    for key in keys:
+        full_count = len(full_series[key]) if key in full_series else 0
+        sample_count = len(sample_series[key]) if key in sample_series else 0
         compression = 100 - round((sample_count / full_count) * 100, 2) if full_count else 100
-        st.subheader(f"Compression Ratio for {key}")
-        fig = go.Figure(go.Indicator(mode="gauge+number", value=compression,
-                                     gauge={'axis': {'range': [0, 100]},
-                                            'bar': {'color': "orange"}},
-                                     title={'text': f"Compression %"}))
-        fig.update_layout(template="plotly_dark")
-        st.plotly_chart(fig, use_container_width=True, key=f"compression_chart_{idx}")
-
-    def get_lifecycle(series):
-        voltage_df = series.get("Voltage-Battery")
-        if voltage_df is None:
-            return 0
-        voltage_df["Date"] = voltage_df["Timestamp"].dt.date
-        daily = voltage_df.groupby("Date").agg({"Voltage-Battery": ["min"]}).reset_index()
-        daily.columns = ["Date", "Min Voltage"]
-        dod = ((13.7 - daily["Min Voltage"]) / 13.7 * 100).round(2)
-        avg_dod = dod.mean().round(2)
-        total_cycles = max(0, round(0.0622*avg_dod**2 - 19.599*avg_dod + 1461.6, 2))
-        return total_cycles - len(daily)
+        compressions.append((key, compression))
+    st.subheader("Compression Ratios")
+    st.plotly_chart(build_compression_gauges(tuple(compressions)), use_container_width=True,
+                    key="compression_charts")
 
     full_remaining = get_lifecycle(full_series)
     sample_remaining = get_lifecycle(sample_series)
@@ -199,6 +344,7 @@ def analyze_compression(file_full, file_sample):
     st.metric("Sample Data Remaining Cycles", round(sample_remaining, 2))
     st.metric("Sqr Error", round(sqr_error,3))
 
+@st.fragment
 def compare_soh(series_data):
     voltage_df = series_data.get("Voltage-Battery")
     if voltage_df is None:
@@ -206,19 +352,20 @@ def compare_soh(series_data):
         return
 
     voltage_full_charge = 13.7  # Default full voltage
-    voltage_df["Date"] = voltage_df["Timestamp"].dt.date
-    daily = voltage_df.groupby("Date").agg({"Voltage-Battery": ["min"]}).reset_index()
-    daily.columns = ["Date", "Min Voltage"]
-    daily["DoD (%)"] = ((voltage_full_charge - daily["Min Voltage"]) / voltage_full_charge * 100).round(2)
-    avg_dod = daily["DoD (%)"].mean().round(2)
-    total_cycles = max(0, round(0.0622 * avg_dod**2 - 19.599 * avg_dod + 1461.6, 2))
+    daily = daily_min_voltage(voltage_df)
+    dod = np.round((voltage_full_charge - daily["Min Voltage"].to_numpy()) * (100.0 / voltage_full_charge), 2)
+    daily["DoD (%)"] = dod
+    avg_dod = round(float(dod.mean()), 2)
+    total_cycles = estimate_total_cycles(avg_dod)
 
-    daily["Lifecycle Remaining (%)"] = daily.index.to_series().apply(
-        lambda i: max(0, ((total_cycles - i) / total_cycles) * 100)).round(2)
+    used = np.arange(len(daily), dtype=np.float64)
+    daily["Lifecycle Remaining (%)"] = np.round(
+        np.clip((total_cycles - used) / total_cycles * 100, 0, None), 2)
 
     # Linear SOH baseline (100% to 0% over 1460 days)
-    baseline_days = (pd.to_datetime(daily["Date"]) - pd.to_datetime(daily["Date"]).min()).dt.days
-    daily["Ideal Linear SOH (%)"] = ((1460 - baseline_days) / 1460 * 100).clip(lower=0).round(2)
+    dates = daily["Date"].to_numpy("datetime64[D]")
+    baseline_days = (dates - dates[0]).astype(np.int64)
+    daily["Ideal Linear SOH (%)"] = np.round(np.clip((1460 - baseline_days) / 1460 * 100, 0, None), 2)
 
     fig = go.Figure()
     fig.add_trace(go.Scatter(x=daily["Date"], y=daily["Lifecycle Remaining (%)"],
@@ -226,7 +373,7 @@ def compare_soh(series_data):
     fig.add_trace(go.Scatter(x=daily["Date"], y=daily["Ideal Linear SOH (%)"],
                              mode='lines', name="Linear SOH Decline", line=dict(color="orange", dash='dash')))
     fig.update_layout(title="Battery SOH Comparison", xaxis_title="Date", yaxis_title="State of Health (%)",
-                      template="plotly_dark", hovermode="x unified")
+                      **DARK_LAYOUT)
     st.plotly_chart(fig, use_container_width=True)
 
     st.dataframe(daily[["Date", "Lifecycle Remaining (%)", "Ideal Linear SOH (%)"]])